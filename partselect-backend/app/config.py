@@ -27,6 +27,7 @@ class Settings(BaseSettings):
     CHROMA_HOST: str = "localhost"
     CHROMA_PORT: int = 8001
     CHROMA_COLLECTION: str = "partselect_knowledge"
+    CHROMA_BATCH_SIZE: int = 250
     
     # Embeddings
     EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
@@ -4,13 +4,15 @@ Fixed to handle foreign key violations
 """
 
 import asyncio
+import contextlib
 import asyncpg
 import pandas as pd
+import pyarrow.parquet as pq
 import chromadb
 from chromadb.config import Settings
 from sentence_transformers import SentenceTransformer
 from pathlib import Path
-import json
+import orjson
 import sys
 
 # Add parent directory to path for config import
@@ -20,6 +22,41 @@ from app.config import get_settings
 settings = get_settings()
 
 
+def _parse_metadata(raw) -> dict:
+    """Parse a stored metadata cell into a dict"""
+    if isinstance(raw, dict):
+        return raw
+    try:
+        return orjson.loads(raw)
+    except (orjson.JSONDecodeError, TypeError):
+        return {}
+
+
+def _parse_recommended_parts(raw) -> str:
+    """Normalize a recommended_parts cell to a JSON array of part numbers; malformed -> []"""
+    try:
+        parts = orjson.loads(raw) if isinstance(raw, (str, bytes)) else raw
+    except orjson.JSONDecodeError:
+        parts = []
+    if not isinstance(parts, list):
+        parts = []
+    return orjson.dumps([p for p in parts if isinstance(p, str)]).decode()
+
+
+def _clean_meta_value(value):
+    """Coerce a metadata value to a type ChromaDB accepts (str, int, float, bool, None)"""
+    if isinstance(value, list):
+        # Convert list to comma-separated string
+        return ", ".join(str(v) for v in value) if value else ""
+    if isinstance(value, dict):
+        # Convert dict to JSON string
+        return orjson.dumps(value).decode()
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    # Convert anything else to string
+    return str(value)
+
+
 async def load_products(conn: asyncpg.Connection, df: pd.DataFrame):
     """Load products into PostgreSQL"""
     print("\n📦 Loading products to PostgreSQL...")
@@ -40,19 +77,41 @@ async def load_products(conn: asyncpg.Connection, df: pd.DataFrame):
             row['brand'] if pd.notna(row['brand']) else None
         ))
     
-    # Bulk insert with conflict handling
-    await conn.executemany('''
+    # COPY into an UNLOGGED staging table, then merge set-based so rows
+    # that didn't change never generate an UPDATE (or its WAL)
+    await conn.execute('''
+        CREATE UNLOGGED TABLE IF NOT EXISTS products_staging AS
+        SELECT part_number, name, description, category, price,
+               in_stock, image_urls, specifications, rating, reviews_count, brand
+        FROM products WITH NO DATA
+    ''')
+    await conn.execute("TRUNCATE products_staging")
+    await conn.copy_records_to_table(
+        'products_staging',
+        records=records,
+        columns=[
+            'part_number', 'name', 'description', 'category', 'price',
+            'in_stock', 'image_urls', 'specifications', 'rating', 'reviews_count', 'brand'
+        ]
+    )
+    
+    await conn.execute('''
         INSERT INTO products (
             part_number, name, description, category, price,
             in_stock, image_urls, specifications, rating, reviews_count, brand
-        ) VALUES ($1, $2, $3, $4, $5, $6, $7::jsonb, $8::jsonb, $9, $10, $11)
+        )
+        SELECT part_number, name, description, category, price,
+               in_stock, image_urls, specifications, rating, reviews_count, brand
+        FROM products_staging
         ON CONFLICT (part_number) DO UPDATE SET
             name = EXCLUDED.name,
             price = EXCLUDED.price,
             in_stock = EXCLUDED.in_stock,
             description = EXCLUDED.description,
             updated_at = CURRENT_TIMESTAMP
-    ''', records)
+        WHERE (products.name, products.price, products.in_stock, products.description)
+            IS DISTINCT FROM (EXCLUDED.name, EXCLUDED.price, EXCLUDED.in_stock, EXCLUDED.description)
+    ''')
     
     print(f"✓ Loaded {len(records)} products")
 
@@ -95,13 +154,15 @@ async def load_installation_guides(conn: asyncpg.Connection, df: pd.DataFrame):
             row['chromadb_doc_id']
         ))
     
-    await conn.executemany('''
+    # Prepare once so executemany reuses the parsed statement
+    stmt = await conn.prepare('''
         INSERT INTO installation_guides (
             part_number, difficulty, estimated_time_minutes,
             tools_required, video_url, pdf_url, chromadb_doc_id
         ) VALUES ($1, $2, $3, $4::jsonb, $5, $6, $7)
         ON CONFLICT DO NOTHING
-    ''', records)
+    ''')
+    await stmt.executemany(records)
     
     print(f"✓ Loaded {len(records)} installation guides")
 
@@ -114,96 +175,85 @@ async def load_troubleshooting_kb(conn: asyncpg.Connection, df: pd.DataFrame):
         print("  (No KB entries to load)")
         return
     
-    # Get list of valid part numbers
-    print("  Checking valid part numbers...")
-    valid_parts = await conn.fetch("SELECT part_number FROM products")
-    valid_part_numbers = set(row['part_number'] for row in valid_parts)
-    
-    # Filter recommended parts in KB entries
-    filtered_entries = []
-    for _, row in df.iterrows():
-        # Parse recommended parts
-        try:
-            recommended = json.loads(row['recommended_parts']) if isinstance(row['recommended_parts'], str) else row['recommended_parts']
-        except:
-            recommended = []
-        
-        # Filter to only valid parts
-        valid_recommended = [p for p in recommended if p in valid_part_numbers]
-        
-        # Only include entry if it has at least one valid part
-        if valid_recommended:
-            filtered_entries.append({
-                'appliance_type': row['appliance_type'],
-                'brand': row['brand'] if pd.notna(row['brand']) else None,
-                'issue_title': row['issue_title'],
-                'symptoms': row['symptoms'],
-                'possible_causes': row['possible_causes'],
-                'diagnostic_steps': row['diagnostic_steps'],
-                'recommended_parts': json.dumps(valid_recommended),
-                'chromadb_doc_id': row['chromadb_doc_id']
-            })
-    
-    original_count = len(df)
-    filtered_count = len(filtered_entries)
-    
-    if filtered_count < original_count:
-        skipped = original_count - filtered_count
-        print(f"  ⚠️  Skipped {skipped} entries (no valid parts)")
-    
-    if len(filtered_entries) == 0:
-        print("  (No valid KB entries to load)")
-        return
-    
     records = []
-    for entry in filtered_entries:
+    for _, row in df.iterrows():
         records.append((
-            entry['appliance_type'],
-            entry['brand'],
-            entry['issue_title'],
-            entry['symptoms'],
-            entry['possible_causes'],
-            entry['diagnostic_steps'],
-            entry['recommended_parts'],
-            entry['chromadb_doc_id']
+            row['appliance_type'],
+            row['brand'] if pd.notna(row['brand']) else None,
+            row['issue_title'],
+            row['symptoms'],
+            row['possible_causes'],
+            row['diagnostic_steps'],
+            _parse_recommended_parts(row['recommended_parts']),  # Filtered server-side below
+            row['chromadb_doc_id']
         ))
     
-    await conn.executemany('''
-        INSERT INTO troubleshooting_kb (
-            appliance_type, brand, issue_title, symptoms,
-            possible_causes, diagnostic_steps, recommended_parts, chromadb_doc_id
-        ) VALUES ($1, $2, $3, $4::jsonb, $5::jsonb, $6::jsonb, $7::jsonb, $8)
-        ON CONFLICT DO NOTHING
-    ''', records)
+    # COPY raw entries into an UNLOGGED staging table
+    await conn.execute('''
+        CREATE UNLOGGED TABLE IF NOT EXISTS troubleshooting_kb_staging AS
+        SELECT appliance_type, brand, issue_title, symptoms,
+               possible_causes, diagnostic_steps, recommended_parts, chromadb_doc_id
+        FROM troubleshooting_kb WITH NO DATA
+    ''')
+    await conn.execute("TRUNCATE troubleshooting_kb_staging")
+    await conn.copy_records_to_table(
+        'troubleshooting_kb_staging',
+        records=records,
+        columns=[
+            'appliance_type', 'brand', 'issue_title', 'symptoms',
+            'possible_causes', 'diagnostic_steps', 'recommended_parts', 'chromadb_doc_id'
+        ]
+    )
     
-    print(f"✓ Loaded {len(records)} troubleshooting entries")
+    # Filter recommended parts against products in SQL (index probes on
+    # part_number) and only keep entries with at least one valid part
+    counts = await conn.fetchrow('''
+        WITH candidates AS (
+            SELECT s.appliance_type, s.brand, s.issue_title, s.symptoms,
+                   s.possible_causes, s.diagnostic_steps, valid.parts, s.chromadb_doc_id
+            FROM troubleshooting_kb_staging s
+            CROSS JOIN LATERAL (
+                SELECT jsonb_agg(rp.part_number ORDER BY rp.ord) AS parts
+                FROM jsonb_array_elements_text(s.recommended_parts)
+                     WITH ORDINALITY AS rp(part_number, ord)
+                WHERE EXISTS (
+                    SELECT 1 FROM products p WHERE p.part_number = rp.part_number
+                )
+            ) valid
+            WHERE valid.parts IS NOT NULL
+        ), inserted AS (
+            INSERT INTO troubleshooting_kb (
+                appliance_type, brand, issue_title, symptoms,
+                possible_causes, diagnostic_steps, recommended_parts, chromadb_doc_id
+            )
+            SELECT * FROM candidates
+            ON CONFLICT DO NOTHING
+            RETURNING 1
+        )
+        SELECT (SELECT COUNT(*) FROM candidates) AS valid_count,
+               (SELECT COUNT(*) FROM inserted) AS loaded_count
+    ''')
+    valid_count = counts['valid_count']
+    loaded_count = counts['loaded_count']
+    
+    no_parts = len(df) - valid_count
+    if no_parts:
+        print(f"  ⚠️  Skipped {no_parts} entries (no valid parts)")
+    conflicts = valid_count - loaded_count
+    if conflicts:
+        print(f"  ⚠️  Skipped {conflicts} entries (already loaded)")
+    
+    print(f"✓ Loaded {loaded_count} troubleshooting entries")
 
 
-def load_chromadb_documents(df: pd.DataFrame, valid_part_numbers: set):
-    """Load documents into ChromaDB - only for valid parts"""
-    print("\n📝 Loading documents to ChromaDB...")
-    
-    # Filter to only documents for valid parts
-    original_count = len(df)
-    df_filtered = df[df['part_number'].isin(valid_part_numbers)].copy()
-    filtered_count = len(df_filtered)
-    
-    if filtered_count < original_count:
-        skipped = original_count - filtered_count
-        print(f"  ⚠️  Skipped {skipped} docs (parts not in products table)")
-    
-    # Remove duplicate doc_ids
-    before_dedup = len(df_filtered)
-    df_filtered = df_filtered.drop_duplicates(subset=['doc_id'], keep='first')
-    after_dedup = len(df_filtered)
+def create_chromadb_collection():
+    """Create a fresh ChromaDB collection and load the embedding model
     
-    if after_dedup < before_dedup:
-        dupes = before_dedup - after_dedup
-        print(f"  ⚠️  Removed {dupes} duplicate documents")
-    
-    if len(df_filtered) == 0:
-        print("  (No valid documents to load)")
-        return
+    Returns (collection, model, pool). The model runs in fp16 on GPU; on
+    CPU-only hosts a multi-process encode pool is started instead, and the
+    caller is responsible for stopping it.
+    """
+    print("\n📝 Preparing ChromaDB collection...")
     
     # Connect to ChromaDB
     client = chromadb.HttpClient(
@@ -228,56 +278,88 @@ def load_chromadb_documents(df: pd.DataFrame, valid_part_numbers: set):
     # Load embedding model
     print("  Loading embedding model...")
     embedding_model = SentenceTransformer(settings.EMBEDDING_MODEL)
-    print("  ✓ Model loaded")
+    embedding_pool = None
+    if embedding_model.device.type == "cuda":
+        embedding_model.half()
+        print("  ✓ Model loaded (GPU, fp16)")
+    else:
+        embedding_pool = embedding_model.start_multi_process_pool()
+        print("  ✓ Model loaded (CPU, multi-process pool)")
+    
+    return collection, embedding_model, embedding_pool
+
+
+def load_chromadb_documents(
+    df: pd.DataFrame,
+    valid_part_numbers: set,
+    collection,
+    embedding_model: SentenceTransformer,
+    embedding_pool,
+    seen_doc_ids: set
+) -> int:
+    """Load one batch of documents into ChromaDB - only for valid parts"""
+    print(f"\n📝 Loading {len(df)} documents to ChromaDB...")
+    
+    # Filter to only documents for valid parts
+    original_count = len(df)
+    df_filtered = df[df['part_number'].isin(valid_part_numbers)].copy()
+    filtered_count = len(df_filtered)
+    
+    if filtered_count < original_count:
+        skipped = original_count - filtered_count
+        print(f"  ⚠️  Skipped {skipped} docs (parts not in products table)")
+    
+    # Remove duplicate doc_ids (within this chunk and against earlier chunks)
+    before_dedup = len(df_filtered)
+    df_filtered = df_filtered.drop_duplicates(subset=['doc_id'], keep='first')
+    df_filtered = df_filtered[~df_filtered['doc_id'].isin(seen_doc_ids)]
+    seen_doc_ids.update(df_filtered['doc_id'])
+    after_dedup = len(df_filtered)
+    
+    if after_dedup < before_dedup:
+        dupes = before_dedup - after_dedup
+        print(f"  ⚠️  Removed {dupes} duplicate documents")
+    
+    if len(df_filtered) == 0:
+        print("  (No valid documents to load)")
+        return 0
+    
+    # Clean metadata for all documents up front; each record keeps exactly its own keys
+    all_metadatas = [
+        {
+            **{k: _clean_meta_value(v) for k, v in _parse_metadata(raw).items()},
+            'doc_type': str(doc_type),
+            'part_number': str(part_number)
+        }
+        for raw, doc_type, part_number in zip(
+            df_filtered['metadata'], df_filtered['doc_type'], df_filtered['part_number']
+        )
+    ]
+    
+    # Pull the columns out once; batches below are plain array slices
+    ids_arr = df_filtered['doc_id'].to_numpy()
+    content_arr = df_filtered['content'].to_numpy()
+    
+    # Generate embeddings for the whole chunk in one call
+    all_embeddings = embedding_model.encode(
+        content_arr.tolist(),
+        pool=embedding_pool,
+        batch_size=64,
+        show_progress_bar=False
+    )
     
     # Process in batches
-    batch_size = 100
+    batch_size = settings.CHROMA_BATCH_SIZE
     total_docs = len(df_filtered)
     
     print(f"  Processing {total_docs} documents in batches of {batch_size}...")
     
     for i in range(0, total_docs, batch_size):
-        batch = df_filtered.iloc[i:i+batch_size]
-        
         # Prepare data
-        ids = batch['doc_id'].tolist()
-        documents = batch['content'].tolist()
-        
-        # Parse metadata and clean it for ChromaDB
-        metadatas = []
-        for _, row in batch.iterrows():
-            # Parse stored metadata
-            try:
-                meta = json.loads(row['metadata']) if isinstance(row['metadata'], str) else row['metadata']
-            except:
-                meta = {}
-            
-            # ChromaDB only allows: str, int, float, bool, None
-            # Convert lists and dicts to strings
-            clean_meta = {}
-            for key, value in meta.items():
-                if isinstance(value, list):
-                    # Convert list to comma-separated string
-                    clean_meta[key] = ", ".join(str(v) for v in value) if value else ""
-                elif isinstance(value, dict):
-                    # Convert dict to JSON string
-                    clean_meta[key] = json.dumps(value)
-                elif value is None:
-                    clean_meta[key] = None
-                elif isinstance(value, (str, int, float, bool)):
-                    clean_meta[key] = value
-                else:
-                    # Convert anything else to string
-                    clean_meta[key] = str(value)
-            
-            # Add doc_type and part_number (already primitives)
-            clean_meta['doc_type'] = str(row['doc_type'])
-            clean_meta['part_number'] = str(row['part_number'])
-            
-            metadatas.append(clean_meta)
-        
-        # Generate embeddings
-        embeddings = embedding_model.encode(documents, show_progress_bar=False).tolist()
+        ids = ids_arr[i:i+batch_size].tolist()
+        documents = content_arr[i:i+batch_size].tolist()
+        metadatas = all_metadatas[i:i+batch_size]
+        embeddings = all_embeddings[i:i+batch_size].tolist()
         
         # Add to ChromaDB
         try:
@@ -290,7 +372,7 @@ def load_chromadb_documents(df: pd.DataFrame, valid_part_numbers: set):
             
             batch_num = i//batch_size + 1
             total_batches = (total_docs-1)//batch_size + 1
-            print(f"  ✓ Batch {batch_num}/{total_batches} ({len(batch)} docs)")
+            print(f"  ✓ Batch {batch_num}/{total_batches} ({len(ids)} docs)")
             
         except Exception as e:
             print(f"  ❌ Error in batch {i//batch_size + 1}: {e}")
@@ -298,7 +380,7 @@ def load_chromadb_documents(df: pd.DataFrame, valid_part_numbers: set):
             print(f"     Sample metadata: {metadatas[0] if metadatas else 'none'}")
             raise
     
-    print(f"✓ Loaded {total_docs} documents to ChromaDB")
+    return total_docs
 
 
 async def verify_data():
@@ -388,10 +470,10 @@ async def main():
     # Check processed files exist
     processed_dir = Path("data/processed")
     required_files = [
-        "products.csv",
-        "installation_guides.csv",
-        "troubleshooting_kb.csv",
-        "chromadb_documents.csv"
+        "products.parquet",
+        "installation_guides.parquet",
+        "troubleshooting_kb.parquet",
+        "chromadb_documents.parquet"
     ]
     
     for filename in required_files:
@@ -401,22 +483,29 @@ async def main():
             print("\nRun 'python scripts/process_combined.py' first!")
             return
     
-    # Load CSVs
-    print("\n📂 Loading processed CSV files...")
-    products_df = pd.read_csv("data/processed/products.csv")
-    guides_df = pd.read_csv("data/processed/installation_guides.csv")
-    kb_df = pd.read_csv("data/processed/troubleshooting_kb.csv")
-    docs_df = pd.read_csv("data/processed/chromadb_documents.csv")
+    # Load Parquet files and connect to PostgreSQL concurrently
+    # (ChromaDB documents are streamed in chunks later)
+    print("\n📂 Loading processed Parquet files and connecting to PostgreSQL...")
+    db_url = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
+    connect_task = asyncio.create_task(asyncpg.connect(db_url))
+    try:
+        products_df, guides_df, kb_df = await asyncio.gather(
+            asyncio.to_thread(pd.read_parquet, "data/processed/products.parquet"),
+            asyncio.to_thread(pd.read_parquet, "data/processed/installation_guides.parquet"),
+            asyncio.to_thread(pd.read_parquet, "data/processed/troubleshooting_kb.parquet")
+        )
+        conn = await connect_task
+    except BaseException:
+        # A failed read must not leak a connection that already succeeded
+        connect_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await (await connect_task).close()
+        raise
     
     print(f"  ✓ Products: {len(products_df)}")
     print(f"  ✓ Installation guides: {len(guides_df)}")
     print(f"  ✓ Troubleshooting KB: {len(kb_df)}")
-    print(f"  ✓ ChromaDB documents: {len(docs_df)}")
-    
-    # Connect to PostgreSQL
-    print("\n🔌 Connecting to PostgreSQL...")
-    db_url = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
-    conn = await asyncpg.connect(db_url)
+    print("  ✓ Connected to PostgreSQL")
     
     try:
         # Load products first (they have no foreign keys)
@@ -449,9 +538,22 @@ async def main():
     
     print(f"  ✓ Found {len(valid_part_numbers)} valid parts")
     
-    # Load to ChromaDB with filtering
+    # Load to ChromaDB with filtering, one Parquet record batch at a time
     try:
-        load_chromadb_documents(docs_df, valid_part_numbers)
+        collection, embedding_model, embedding_pool = create_chromadb_collection()
+        seen_doc_ids = set()
+        total_docs = 0
+        try:
+            docs_file = pq.ParquetFile("data/processed/chromadb_documents.parquet")
+            for docs_batch in docs_file.iter_batches(batch_size=10_000):
+                total_docs += load_chromadb_documents(
+                    docs_batch.to_pandas(), valid_part_numbers, collection,
+                    embedding_model, embedding_pool, seen_doc_ids
+                )
+        finally:
+            if embedding_pool is not None:
+                embedding_model.stop_multi_process_pool(embedding_pool)
+        print(f"✓ Loaded {total_docs} documents to ChromaDB")
     except Exception as e:
         print(f"\n❌ Error loading to ChromaDB: {e}")
         import traceback
@@ -475,4 +577,10 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # uvloop's libuv-based loop when available, stdlib asyncio otherwise
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file
@@ -3,49 +3,174 @@ Process both refrigerator and dishwasher data files
 Complete standalone script
 """
 
-import json
+import hashlib
+import itertools
+import ijson
+import orjson
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Union
+import multiprocessing
 import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+
+# Fields written by the scrapers for every part
+RAW_FIELDS = [
+    "part_name", "part_id", "mpn_id", "part_price", "install_difficulty",
+    "install_time", "symptoms", "product_types", "replace_parts", "brand",
+    "availability", "install_video_url", "product_url"
+]
+
+_NON_PRICE_CHARS = r'[^\d.]'
+_DIGITS_RE = re.compile(r'(\d+)')
+_SYMPTOM_SPLIT_RE = re.compile(r'\n+')
+
+
+# install_difficulty only takes a handful of distinct values, so it is cached
+# at module level (None is coerced to "" by the caller)
+@lru_cache(maxsize=1024)
+def _parse_install_difficulty(difficulty_str: str) -> str:
+    if not difficulty_str or difficulty_str == "N/A":
+        return "moderate"
+    difficulty_lower = difficulty_str.lower()
+    if "easy" in difficulty_lower or "simple" in difficulty_lower:
+        return "easy"
+    elif "hard" in difficulty_lower or "difficult" in difficulty_lower:
+        return "hard"
+    else:
+        return "moderate"
+
+
+def _describe(name: Optional[str], brand: Optional[str],
+              product_types: Optional[str], symptoms: List[str]) -> str:
+    return ". ".join(part for part in (
+        name,
+        f"Fixes: {', '.join(symptoms[:3])}" if symptoms else None,
+        f"Brand: {brand}" if brand else None,
+        f"For: {product_types}" if product_types else None
+    ) if part)
+
+
+def iter_json_items(path) -> Iterator[Dict]:
+    """Stream the objects of a top-level JSON array without loading the whole file"""
+    with open(path, 'rb') as f:
+        yield from ijson.items(f, 'item', use_float=True)
+
+
+def iter_counted(items: Iterable[Dict], counts: Dict[str, int], label: str) -> Iterator[Dict]:
+    """Pass items through unchanged, tallying them in counts[label]"""
+    counts[label] = 0
+    for item in items:
+        counts[label] += 1
+        yield item
+
+
+def tee_json_array(items: Iterable[Dict], path) -> Iterator[Dict]:
+    """Pass items through unchanged while writing them to path as an indented JSON array"""
+    count = 0
+    with open(path, 'wb') as f:
+        f.write(b"[")
+        for item in items:
+            f.write(b",\n  " if count else b"\n  ")
+            f.write(orjson.dumps(item, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n  "))
+            count += 1
+            yield item
+        f.write(b"\n]" if count else b"]")
+
+
+# Raw items are derived this many at a time, so only one chunk of dicts is alive at once
+CHUNK_ROWS = 10_000
+
+
+# Only two appliance categories exist, so store them as 1-byte codes
+CATEGORY_DTYPE = pd.CategoricalDtype(["refrigerator", "dishwasher"])
+
+
+def _with_arrow_strings(df: pd.DataFrame, text_columns: List[str]) -> pd.DataFrame:
+    """Store text columns as contiguous Arrow strings instead of Python objects"""
+    return df.astype({col: "string[pyarrow]" for col in text_columns})
+
+
+def _prefixed_ids(prefix: str, part_ids: pd.Series) -> pd.Series:
+    """Build doc ids like "product_<part>" in one Arrow concat instead of per-row f-strings"""
+    return prefix + part_ids.astype("string[pyarrow]")
+
+
+# Output name -> DataProcessor.process_* stage; the stages are independent
+STAGES = ["products", "installation_guides", "troubleshooting_kb", "chromadb_documents"]
+
+# Set in each forked worker by _init_worker; inherited from the parent, never pickled
+_worker_processor = None
+
+
+def _init_worker(processor: "DataProcessor"):
+    global _worker_processor
+    _worker_processor = processor
+
+
+def _run_stage(stage: str) -> pd.DataFrame:
+    return getattr(_worker_processor, f"process_{stage}")()
 
 
 class DataProcessor:
-    def __init__(self, input_file: str):
-        self.input_file = Path(input_file)
-        self.data = self._load_data()
-        
-    def _load_data(self) -> List[Dict]:
-        print(f"📂 Loading data from {self.input_file}")
-        with open(self.input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        print(f"✓ Loaded {len(data)} products")
-        return data
+    def __init__(self, input_data: Union[str, Path, Iterable[Dict]]):
+        """Accepts a path to a JSON array or an iterable of items; both are streamed"""
+        if isinstance(input_data, (str, Path)):
+            self.input_file = Path(input_data)
+            print(f"📂 Loading data from {self.input_file}")
+            self.items = self._derive_chunks(iter_json_items(self.input_file))
+            print(f"✓ Loaded {len(self.items)} products")
+        else:
+            self.input_file = None
+            self.items = self._derive_chunks(input_data)
+            print(f"✓ Received {len(self.items)} products")
     
-    def clean_price(self, price_str: str) -> Optional[float]:
-        if not price_str or price_str == "N/A":
-            return None
-        price_cleaned = re.sub(r'[^\d.]', '', str(price_str))
-        try:
-            return float(price_cleaned)
-        except ValueError:
-            return None
+    def _derive_chunks(self, items: Iterable[Dict]) -> pd.DataFrame:
+        """Derive CHUNK_ROWS raw items at a time; only the derived frames are kept"""
+        iterator = iter(items)
+        frames = [
+            self._derive_items(chunk)
+            for chunk in iter(lambda: list(itertools.islice(iterator, CHUNK_ROWS)), [])
+        ]
+        if not frames:
+            return self._derive_items([])
+        return pd.concat(frames, ignore_index=True)
     
-    def parse_category(self, product_types: str) -> str:
-        if not product_types:
-            return "dishwasher"
-        product_types_lower = product_types.lower()
-        if "refrigerator" in product_types_lower or "freezer" in product_types_lower:
-            return "refrigerator"
-        elif "dishwasher" in product_types_lower:
-            return "dishwasher"
-        else:
-            return "dishwasher"
+    def _derive_items(self, data: List[Dict]) -> pd.DataFrame:
+        """Single pass over the raw items computing the values every stage shares"""
+        # Columnar view of the raw items; missing values become None like item.get()
+        items = pd.DataFrame.from_records(data, columns=RAW_FIELDS)
+        items = items.astype(object).where(items.notna(), None)
+        
+        # String kernels run on Arrow buffers instead of object-dtype Python strings
+        text_fields = ["product_types", "part_price", "availability"]
+        arrow = _with_arrow_strings(items[text_fields], text_fields)
+        product_types = arrow["product_types"].fillna("").str.lower()
+        is_refrigerator = product_types.str.contains("refrigerator|freezer", regex=True)
+        items["category"] = np.where(is_refrigerator, "refrigerator", "dishwasher")
+        items["price"] = pd.to_numeric(
+            arrow["part_price"].str.replace(_NON_PRICE_CHARS, '', regex=True), errors="coerce"
+        ).astype("float64")
+        # Missing availability is not in stock
+        items["in_stock"] = arrow["availability"].str.lower().eq("in stock").fillna(False).astype(bool)
+        items["symptom_list"] = items["symptoms"].map(self.parse_symptoms)
+        # Fixed schema: read the description fields positionally from the columns
+        items["description"] = [
+            _describe(name, brand, types, symptoms)
+            for name, brand, types, symptoms in zip(
+                items["part_name"], items["brand"], items["product_types"], items["symptom_list"]
+            )
+        ]
+        return items
     
     def parse_symptoms(self, symptoms_str: str) -> List[str]:
         if not symptoms_str or symptoms_str == "N/A":
             return []
-        symptoms = [s.strip() for s in symptoms_str.split('\n') if s.strip()]
+        symptoms = [s.strip() for s in _SYMPTOM_SPLIT_RE.split(symptoms_str) if s.strip()]
         return symptoms
     
     def parse_replace_parts(self, replace_parts_str: str) -> List[str]:
@@ -55,217 +180,221 @@ class DataProcessor:
         return parts
     
     def parse_install_difficulty(self, difficulty_str: str) -> Optional[str]:
-        if not difficulty_str or difficulty_str == "N/A":
-            return "moderate"
-        difficulty_lower = str(difficulty_str).lower()
-        if "easy" in difficulty_lower or "simple" in difficulty_lower:
-            return "easy"
-        elif "hard" in difficulty_lower or "difficult" in difficulty_lower:
-            return "hard"
-        else:
-            return "moderate"
-    
-    def parse_install_time(self, time_str: str) -> Optional[int]:
-        if not time_str or time_str == "N/A":
-            return 30
-        time_lower = str(time_str).lower()
-        minutes = re.findall(r'\d+', time_lower)
-        if not minutes:
-            return 30
-        time_value = int(minutes[0])
-        if "hour" in time_lower:
-            time_value *= 60
-        return time_value
+        return _parse_install_difficulty(str(difficulty_str) if difficulty_str else "")
     
-    def generate_description(self, item: Dict) -> str:
-        parts = []
-        if item.get("part_name"):
-            parts.append(item["part_name"])
-        if item.get("symptoms") and item["symptoms"] != "N/A":
-            symptoms = self.parse_symptoms(item["symptoms"])
-            if symptoms:
-                parts.append(f"Fixes: {', '.join(symptoms[:3])}")
-        if item.get("brand"):
-            parts.append(f"Brand: {item['brand']}")
-        if item.get("product_types"):
-            parts.append(f"For: {item['product_types']}")
-        return ". ".join(parts)
+    def parse_install_times(self, times: pd.Series) -> pd.Series:
+        """Minutes per install_time string ("1 hour" -> 60); missing or unparseable -> 30"""
+        times_lower = times.fillna("").astype(str).str.lower()
+        minutes = pd.to_numeric(times_lower.str.extract(_DIGITS_RE, expand=False))
+        minutes = minutes.where(~times_lower.str.contains("hour", regex=False), minutes * 60)
+        return minutes.fillna(30).astype("int64")
     
     def process_products(self) -> pd.DataFrame:
         print("\n📦 Processing products...")
-        products = []
         
-        for item in self.data:
-            product = {
-                "part_number": item.get("part_id"),
-                "name": item.get("part_name"),
-                "description": self.generate_description(item),
-                "category": self.parse_category(item.get("product_types")),
-                "brand": item.get("brand"),
-                "price": self.clean_price(item.get("part_price")),
-                "in_stock": str(item.get("availability", "")).lower() == "in stock",
-                "specifications": json.dumps({
-                    "mpn": item.get("mpn_id"),
-                    "replace_parts": self.parse_replace_parts(item.get("replace_parts", "")),
-                    "product_url": item.get("product_url"),
-                    "symptoms": self.parse_symptoms(item.get("symptoms", ""))
-                }),
-                "image_urls": json.dumps([]),
-                "rating": None,
-                "reviews_count": 0
-            }
-            products.append(product)
+        # Dedupe on Arrow part numbers and filter before building any columns
+        items = self.items
+        part_numbers = items["part_id"].astype("string[pyarrow]")
+        keep = (
+            part_numbers.notna()
+            & items["part_name"].notna()
+            & items["price"].notna()
+            & ~part_numbers.duplicated(keep='first')
+        )
+        items = items.loc[keep].reset_index(drop=True)
+        
+        specifications = pd.DataFrame({
+            "mpn": items["mpn_id"],
+            "replace_parts": items["replace_parts"].map(self.parse_replace_parts),
+            "product_url": items["product_url"],
+            "symptoms": items["symptom_list"]
+        }).to_dict(orient="records")
         
-        df = pd.DataFrame(products)
-        df = df.drop_duplicates(subset=['part_number'], keep='first')
-        df = df[df['part_number'].notna()]
-        df = df[df['name'].notna()]
-        df = df[df['price'].notna()]
+        df = pd.DataFrame({
+            "part_number": items["part_id"],
+            "name": items["part_name"],
+            "description": items["description"],
+            "category": items["category"],
+            "brand": items["brand"],
+            "price": items["price"],
+            "in_stock": items["in_stock"],
+            "specifications": [orjson.dumps(spec).decode() for spec in specifications],
+            "image_urls": orjson.dumps([]).decode(),
+            "rating": None,
+            "reviews_count": 0
+        })
+        df = _with_arrow_strings(df, [
+            "part_number", "name", "description", "brand", "specifications", "image_urls"
+        ]).astype({"category": CATEGORY_DTYPE})
         
         print(f"✓ Processed {len(df)} products")
         return df
     
     def process_installation_guides(self) -> pd.DataFrame:
         print("\n🔧 Processing installation guides...")
-        guides = []
+        items = self.items
         
-        for item in self.data:
-            has_video = item.get("install_video_url") and item["install_video_url"] != "N/A"
-            has_difficulty = item.get("install_difficulty") and item["install_difficulty"] != "N/A"
-            has_time = item.get("install_time") and item["install_time"] != "N/A"
-            
-            if has_video or has_difficulty or has_time:
-                guide = {
-                    "part_number": item.get("part_id"),
-                    "difficulty": self.parse_install_difficulty(item.get("install_difficulty")),
-                    "estimated_time_minutes": self.parse_install_time(item.get("install_time")),
-                    "tools_required": json.dumps(["screwdriver"]),
-                    "video_url": item.get("install_video_url") if has_video else None,
-                    "pdf_url": None,
-                    "chromadb_doc_id": f"install_{item.get('part_id')}"
-                }
-                guides.append(guide)
+        # Present means non-empty and not the scraper's "N/A" placeholder
+        has_video = ~items["install_video_url"].fillna("").isin(["", "N/A"])
+        has_difficulty = ~items["install_difficulty"].fillna("").isin(["", "N/A"])
+        has_time = ~items["install_time"].fillna("").isin(["", "N/A"])
+        has_guide = has_video | has_difficulty | has_time
         
-        df = pd.DataFrame(guides) if guides else pd.DataFrame()
-        if len(df) > 0:
-            df = df.drop_duplicates(subset=['part_number'], keep='first')
+        # One mask for "has guide data" and "first guide for this part"
+        is_repeat = items.loc[has_guide, "part_id"].duplicated(keep='first')
+        mask = has_guide & ~is_repeat.reindex(items.index, fill_value=False)
+        guide_items = items[mask]
+        
+        df = pd.DataFrame({
+            "part_number": guide_items["part_id"],
+            "difficulty": guide_items["install_difficulty"].map(self.parse_install_difficulty),
+            "estimated_time_minutes": self.parse_install_times(guide_items["install_time"]),
+            "tools_required": orjson.dumps(["screwdriver"]).decode(),
+            "video_url": guide_items["install_video_url"].where(has_video[mask], None),
+            "pdf_url": None,
+            "chromadb_doc_id": _prefixed_ids("install_", guide_items["part_id"])
+        })
+        df = _with_arrow_strings(df, [
+            "part_number", "difficulty", "tools_required", "video_url", "chromadb_doc_id"
+        ])
         
         print(f"✓ Processed {len(df)} installation guides")
         return df
     
     def process_troubleshooting_kb(self) -> pd.DataFrame:
         print("\n🔍 Processing troubleshooting knowledge base...")
-        symptom_to_parts = {}
+        symptom_to_parts = defaultdict(lambda: {
+            "appliance_type": None,
+            "issue_title": None,
+            "symptoms": [],
+            "brands": set(),
+            "parts": []
+        })
         
-        for item in self.data:
-            symptoms = self.parse_symptoms(item.get("symptoms", ""))
-            part_number = item.get("part_id")
-            category = self.parse_category(item.get("product_types"))
-            brand = item.get("brand")
-            
+        items = self.items
+        for part_number, brand, category, symptoms in zip(
+            items["part_id"], items["brand"], items["category"], items["symptom_list"]
+        ):
             for symptom in symptoms:
-                key = f"{category}:{symptom}"
-                
-                if key not in symptom_to_parts:
-                    symptom_to_parts[key] = {
-                        "appliance_type": category,
-                        "issue_title": symptom,
-                        "symptoms": [symptom],
-                        "brands": set(),
-                        "parts": []
-                    }
+                entry = symptom_to_parts[f"{category}:{symptom}"]
+                if entry["issue_title"] is None:
+                    entry["appliance_type"] = category
+                    entry["issue_title"] = symptom
+                    entry["symptoms"].append(symptom)
                 
                 if brand:
-                    symptom_to_parts[key]["brands"].add(brand)
-                symptom_to_parts[key]["parts"].append(part_number)
-        
-        kb_entries = []
-        for key, data in symptom_to_parts.items():
-            entry = {
-                "appliance_type": data["appliance_type"],
-                "brand": ", ".join(sorted(data["brands"])) if data["brands"] else None,
-                "issue_title": data["issue_title"],
-                "symptoms": json.dumps(data["symptoms"]),
-                "possible_causes": json.dumps([]),
-                "diagnostic_steps": json.dumps([]),
-                "recommended_parts": json.dumps(data["parts"][:10]),
-                "chromadb_doc_id": f"troubleshoot_{abs(hash(key)) % 100000}"
-            }
-            kb_entries.append(entry)
+                    entry["brands"].add(brand)
+                entry["parts"].append(part_number)
         
-        df = pd.DataFrame(kb_entries) if kb_entries else pd.DataFrame()
+        keys = list(symptom_to_parts)
+        entries = list(symptom_to_parts.values())
+        df = pd.DataFrame({
+            "appliance_type": [e["appliance_type"] for e in entries],
+            "brand": [", ".join(sorted(e["brands"])) if e["brands"] else None for e in entries],
+            "issue_title": [e["issue_title"] for e in entries],
+            "symptoms": [orjson.dumps(e["symptoms"]).decode() for e in entries],
+            "possible_causes": orjson.dumps([]).decode(),
+            "diagnostic_steps": orjson.dumps([]).decode(),
+            "recommended_parts": [orjson.dumps(e["parts"][:10]).decode() for e in entries],
+            # Stable across runs (unlike hash()) and wide enough not to collide
+            "chromadb_doc_id": [
+                "troubleshoot_" + hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+                for key in keys
+            ]
+        })
+        df = _with_arrow_strings(df, [
+            "brand", "issue_title", "symptoms", "possible_causes",
+            "diagnostic_steps", "recommended_parts", "chromadb_doc_id"
+        ]).astype({"appliance_type": CATEGORY_DTYPE})
         print(f"✓ Processed {len(df)} troubleshooting entries")
         return df
     
     def process_chromadb_documents(self) -> pd.DataFrame:
         print("\n📝 Processing ChromaDB documents...")
-        documents = []
+        items = self.items
         
-        for item in self.data:
-            part_number = item.get("part_id")
-            
-            # Product document
-            product_doc = {
-                "doc_id": f"product_{part_number}",
-                "doc_type": "product",
-                "part_number": part_number,
-                "content": self.generate_description(item),
-                "metadata": json.dumps({
-                    "category": self.parse_category(item.get("product_types")),
-                    "brand": item.get("brand"),
-                    "price": self.clean_price(item.get("part_price"))
-                })
-            }
-            documents.append(product_doc)
-            
-            # Installation document
-            if item.get("install_video_url") and item["install_video_url"] != "N/A":
-                install_doc = {
-                    "doc_id": f"install_{part_number}",
-                    "doc_type": "installation",
-                    "part_number": part_number,
-                    "content": f"Installation guide for {item.get('part_name')}. "
-                               f"Difficulty: {item.get('install_difficulty', 'moderate')}. "
-                               f"Estimated time: {item.get('install_time', '30 minutes')}. "
-                               f"Video tutorial available.",
-                    "metadata": json.dumps({
-                        "category": self.parse_category(item.get("product_types")),
-                        "video_url": item.get("install_video_url")
-                    })
-                }
-                documents.append(install_doc)
-            
-            # Troubleshooting document
-            symptoms = self.parse_symptoms(item.get("symptoms", ""))
-            if symptoms:
-                trouble_doc = {
-                    "doc_id": f"troubleshoot_{part_number}",
-                    "doc_type": "troubleshooting",
-                    "part_number": part_number,
-                    "content": f"{item.get('part_name')} is recommended for these issues: {', '.join(symptoms)}. "
-                               f"This is a {self.parse_category(item.get('product_types'))} part from {item.get('brand')}.",
-                    "metadata": json.dumps({
-                        "category": self.parse_category(item.get("product_types")),
-                        "symptoms": symptoms
-                    })
-                }
-                documents.append(trouble_doc)
+        # Product documents: one per part
+        product_docs = pd.DataFrame({
+            "doc_id": _prefixed_ids("product_", items["part_id"]),
+            "doc_type": "product",
+            "part_number": items["part_id"],
+            "content": items["description"],
+            "metadata": [
+                orjson.dumps({"category": category, "brand": brand, "price": price}).decode()
+                for category, brand, price in zip(items["category"], items["brand"], items["price"].tolist())
+            ]
+        })
         
-        df = pd.DataFrame(documents)
+        # Installation documents: parts with an install video
+        video_items = items[~items["install_video_url"].fillna("").isin(["", "N/A"])]
+        install_docs = pd.DataFrame({
+            "doc_id": _prefixed_ids("install_", video_items["part_id"]),
+            "doc_type": "installation",
+            "part_number": video_items["part_id"],
+            "content": [
+                f"Installation guide for {name}. "
+                f"Difficulty: {difficulty}. "
+                f"Estimated time: {install_time}. "
+                f"Video tutorial available."
+                for name, difficulty, install_time in zip(
+                    video_items["part_name"],
+                    video_items["install_difficulty"].fillna("moderate"),
+                    video_items["install_time"].fillna("30 minutes")
+                )
+            ],
+            "metadata": [
+                orjson.dumps({"category": category, "video_url": video_url}).decode()
+                for category, video_url in zip(video_items["category"], video_items["install_video_url"])
+            ]
+        })
+        
+        # Troubleshooting documents: parts with at least one symptom
+        symptom_items = items[items["symptom_list"].str.len() > 0]
+        trouble_docs = pd.DataFrame({
+            "doc_id": _prefixed_ids("troubleshoot_", symptom_items["part_id"]),
+            "doc_type": "troubleshooting",
+            "part_number": symptom_items["part_id"],
+            "content": [
+                f"{name} is recommended for these issues: {', '.join(symptoms)}. "
+                f"This is a {category} part from {brand}."
+                for name, symptoms, category, brand in zip(
+                    symptom_items["part_name"], symptom_items["symptom_list"],
+                    symptom_items["category"], symptom_items["brand"]
+                )
+            ],
+            "metadata": [
+                orjson.dumps({"category": category, "symptoms": symptoms}).decode()
+                for category, symptoms in zip(symptom_items["category"], symptom_items["symptom_list"])
+            ]
+        })
+        
+        df = _with_arrow_strings(
+            pd.concat([product_docs, install_docs, trouble_docs], ignore_index=True),
+            ["doc_id", "doc_type", "part_number", "content", "metadata"]
+        )
         print(f"✓ Processed {len(df)} ChromaDB documents")
         return df
     
-    def process_all(self) -> Dict[str, pd.DataFrame]:
+    def process_all(self, parallel: bool = True) -> Dict[str, pd.DataFrame]:
         print("=" * 60)
         print("🚀 Starting Data Processing Pipeline")
         print("=" * 60)
         
-        results = {
-            "products": self.process_products(),
-            "installation_guides": self.process_installation_guides(),
-            "troubleshooting_kb": self.process_troubleshooting_kb(),
-            "chromadb_documents": self.process_chromadb_documents()
-        }
+        # Only fork where it is already the platform default (not macOS, where it
+        # is unsafe); elsewhere the stages run sequentially in this process
+        if parallel and multiprocessing.get_start_method() == "fork":
+            # Stages are pure-Python and GIL-bound, so run them in separate
+            # processes; fork shares self.items copy-on-write
+            with ProcessPoolExecutor(
+                max_workers=len(STAGES),
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_worker,
+                initargs=(self,)
+            ) as executor:
+                futures = {stage: executor.submit(_run_stage, stage) for stage in STAGES}
+                results = {stage: future.result() for stage, future in futures.items()}
+        else:
+            results = {stage: getattr(self, f"process_{stage}")() for stage in STAGES}
         
         print("\n" + "=" * 60)
         print("✓ Processing Complete!")
@@ -287,8 +416,8 @@ class DataProcessor:
         
         for name, df in results.items():
             if len(df) > 0:
-                filepath = output_path / f"{name}.csv"
-                df.to_csv(filepath, index=False)
+                filepath = output_path / f"{name}.parquet"
+                df.to_parquet(filepath, engine='pyarrow', compression='zstd', index=False)
                 print(f"  ✓ Saved {filepath}")
         
         print("\n🎉 All data saved successfully!")
@@ -315,24 +444,20 @@ def main():
     print("=" * 60)
     print()
     
-    # Combine files
+    # Stream both files through the all_parts.json snapshot straight into the processor
     print(f"📂 Combining data files...")
-    data1 = json.load(open(fridge_file, 'r', encoding='utf-8'))
-    data2 = json.load(open(dishwasher_file, 'r', encoding='utf-8'))
-    
-    print(f"  Refrigerator: {len(data1)} items")
-    print(f"  Dishwasher: {len(data2)} items")
-    
-    combined = data1 + data2
-    print(f"  Combined: {len(combined)} items")
-    
-    # Save combined
-    with open(combined_file, 'w', encoding='utf-8') as f:
-        json.dump(combined, f, indent=2)
-    print(f"✓ Saved to {combined_file}\n")
+    counts = {}
+    combined = tee_json_array(itertools.chain(
+        iter_counted(iter_json_items(fridge_file), counts, "Refrigerator"),
+        iter_counted(iter_json_items(dishwasher_file), counts, "Dishwasher"),
+    ), combined_file)
     
     # Process
-    processor = DataProcessor(combined_file)
+    processor = DataProcessor(combined)
+    for label, count in counts.items():
+        print(f"  {label}: {count} items")
+    print(f"  Combined: {len(processor.items)} items")
+    print(f"✓ Saved to {combined_file}\n")
     processor.save_processed_data()
 
 
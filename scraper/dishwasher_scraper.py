@@ -1,10 +1,29 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import csv
 import json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 import time
 import random
 import os
+import textwrap
+import multiprocessing
+import threading
+import queue
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.util import Finalize
+from functools import lru_cache
+# Optional: preferred for JS-rendered product pages when installed
+try:
+    from playwright.sync_api import sync_playwright, Error as PlaywrightError
+except ImportError:
+    sync_playwright = None
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -15,7 +34,89 @@ from selenium.common.exceptions import StaleElementReferenceException, TimeoutEx
 import urllib.parse
 import socket
 
-def wait_and_find_element(driver, by, value, timeout=10):
+# Columns of every scraped part, in output order
+FIELDNAMES = [
+    'part_name', 'part_id', 'mpn_id', 'part_price', 'install_difficulty',
+    'install_time', 'symptoms', 'product_types', 'replace_parts', 'brand',
+    'availability', 'install_video_url', 'product_url'
+]
+
+# Per-brand CSV/JSON files go here
+OUTPUT_DIR = "scraped_data"
+
+# Brand and product URLs already saved by earlier runs, one per line; keyed by the
+# consolidated output name because both scrapers start from the same brand list
+SEEN_FILE_PATTERN = os.path.join(OUTPUT_DIR, "{output_name}_seen.txt")
+
+# Brands scraped concurrently, each in its own process with its own Chrome
+BRAND_WORKERS = 4
+
+# Brands one Chrome handles before it is recycled, bounding its memory growth
+BRAND_DRIVER_MAX_USES = 20
+
+# Parts scraped concurrently within one category page
+PART_WORKERS = 3
+
+# Chrome features the scraper never uses
+CHROME_LEAN_FLAGS = [
+    "--headless=new",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-translate",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-first-run",
+    "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows",
+]
+
+# Subresources the browser never needs to download for scraping
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.woff*", "*.ttf", "*.css",
+    "*googletagmanager*", "*google-analytics*", "*doubleclick*", "*facebook*",
+]
+
+# Same idea for Playwright, which can filter on resource type
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+# Hides the automation markers; injected into every page by both browser paths
+STEALTH_SCRIPT = """
+Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+window.chrome = {runtime: {}};
+"""
+
+# Browser-like headers for plain HTTP fetches of server-rendered pages
+HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+# Every page is on partselect.com, so keep-alive connections skip a TCP+TLS handshake per fetch
+SESSION = requests.Session()
+SESSION.headers.update(HTTP_HEADERS)
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+))
+
+def dumps_json(obj, indent=False):
+    """Serialize with orjson when installed, otherwise with the stdlib encoder"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None).decode()
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+loads_json = orjson.loads if orjson is not None else json.loads
+
+
+def wait_and_find_element(driver, by, value, timeout=2):
     """Helper function to wait for an element and handle stale element exceptions"""
     wait = WebDriverWait(driver, timeout)
     try:
@@ -25,31 +126,11 @@ def wait_and_find_element(driver, by, value, timeout=10):
         return None
 
 
-def wait_and_find_elements(driver, by, value, timeout=10):
-    """Helper function to wait for elements and handle stale element exceptions"""
-    wait = WebDriverWait(driver, timeout)
-    try:
-        elements = wait.until(EC.presence_of_all_elements_located((by, value)))
-        return elements
-    except (TimeoutException, StaleElementReferenceException):
-        return []
-
-
-def safe_get_text(element):
-    """Safely get text from an element, handling stale element exceptions"""
-    try:
-        return element.text
-    except StaleElementReferenceException:
-        return "N/A"
-
+@lru_cache(maxsize=64)
+def resolve_host(netloc):
+    """Resolve a hostname once per process; hrefs only ever point at a few hosts"""
+    return socket.gethostbyname(netloc)
 
-def safe_get_attribute(element, attribute):
-    """Safely get attribute from an element, handling stale element exceptions"""
-    try:
-        return element.get_attribute(attribute)
-    except StaleElementReferenceException:
-        return "N/A"
-    
 
 def is_valid_url(url):
     """Check if a URL is valid and can be resolved"""
@@ -57,49 +138,58 @@ def is_valid_url(url):
         parsed_url = urllib.parse.urlparse(url)
         if not parsed_url.scheme or not parsed_url.netloc:
             return False
-        socket.gethostbyname(parsed_url.netloc)
+        # Known-good site, no DNS lookup needed
+        if parsed_url.netloc == "partselect.com" or parsed_url.netloc.endswith(".partselect.com"):
+            return True
+        resolve_host(parsed_url.netloc)
         return True
     except (ValueError, socket.gaierror):
         return False
 
 
+# Next free request slot per host. Brand workers swap these for Manager proxies
+# in init_brand_worker so every process draws from the same schedule
+_last_hit = {}
+_pace_lock = threading.Lock()
+
+
+def pace(host, min_gap=2.0, jitter=1.0):
+    """Sleep only as long as needed to keep min_gap (plus jitter) seconds between hits on host,
+    counted across all threads and, inside the brand pool, all worker processes"""
+    with _pace_lock:
+        now = time.monotonic()
+        slot = max(now, _last_hit.get(host, 0) + min_gap + random.uniform(0, jitter))
+        # Reserve the slot before sleeping so concurrent callers queue behind it
+        _last_hit[host] = slot
+    if slot > now:
+        time.sleep(slot - now)
+
+
 def safe_navigate(driver, url, max_retries=3):
-    """Safely navigate to a URL with retries and ensure page is fully loaded"""
+    """Safely navigate to a URL with retries and wait for its key element"""
     for attempt in range(max_retries):
         try:
-            # Add random delay to appear more human (3-8 seconds)
-            delay = random.uniform(3, 8)
-            print(f"Waiting {delay:.1f}s before navigation...")
-            time.sleep(delay)
-            
+            pace(urllib.parse.urlparse(url).netloc, 1.5)
             print(f"Navigating to {url} (attempt {attempt+1}/{max_retries})")
             driver.get(url)
             
-            # Wait for document ready state to be complete
-            wait = WebDriverWait(driver, 30)
-            wait.until(lambda driver: driver.execute_script('return document.readyState') == 'complete')
-            
             # Determine if this is a product page or category page based on URL
             is_product_page = "/PS" in url or ".htm" not in url
             
-            # Wait for key elements that indicate the page has loaded
-            try:
-                if is_product_page:
-                    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.pd__wrap")))
-                    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "span.price.pd__price")))
-                else:
-                    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.container")))
-                    wait.until(EC.presence_of_element_located((By.CLASS_NAME, "nf__links")))
-                
+            # One mandatory element per page type; optional fields are read without waiting
+            if is_product_page:
+                sentinel = (By.CSS_SELECTOR, "div.pd__wrap")
+            else:
+                sentinel = (By.CLASS_NAME, "nf__links")
+            
+            if wait_and_find_element(driver, *sentinel, timeout=30) is not None:
                 print(f"✓ Page loaded successfully")
                 return True
-                
-            except TimeoutException as e:
-                print(f"Timeout waiting for key elements: {str(e)}")
-                if attempt < max_retries - 1:
-                    print("Retrying...")
-                    time.sleep(5)
-                continue
+            
+            print(f"Timeout waiting for {sentinel[1]}")
+            if attempt < max_retries - 1:
+                print("Retrying...")
+                time.sleep(5)
                 
         except WebDriverException as e:
             print(f"Navigation error (attempt {attempt+1}/{max_retries}): {e}")
@@ -113,152 +203,372 @@ def safe_navigate(driver, url, max_retries=3):
     return False
 
 
-def extract_text_after_header(element, header_text):
-    """Extract text after a header in an element"""
+def fetch_page(url, timeout=15):
+    """Fetch a page without a browser and parse it with lxml; returns None on failure"""
+    pace(urllib.parse.urlparse(url).netloc, 1.5)
     try:
-        full_text = safe_get_text(element)
-        if header_text in full_text:
-            return full_text.replace(header_text, "").strip()
-        return full_text
-    except Exception:
-        return "N/A"
+        response = SESSION.get(url, timeout=timeout)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"HTTP fetch failed for {url}: {e}")
+        return None
+    return BeautifulSoup(response.text, "lxml")
 
 
-def scrape_part_info(driver, part_name, product_url):
-    """Scrape information for a specific part from its product page."""
-    data = {
-        'part_name': part_name,
-        'part_id': 'N/A',
-        'mpn_id': 'N/A',
-        'part_price': 'N/A',
-        'install_difficulty': 'N/A',
-        'install_time': 'N/A',
-        'symptoms': 'N/A',
-        'product_types': 'N/A',
-        'replace_parts': 'N/A',
-        'brand': 'N/A',
-        'availability': 'N/A',
-        'install_video_url': 'N/A',
-        'product_url': product_url
+def soup_text(root, selector):
+    """Text of the first element matching selector, or None if it is missing"""
+    element = root.select_one(selector)
+    if element is None:
+        return None
+    # Newline-separated like Selenium's element.text so symptom lists still split
+    return element.get_text("\n", strip=True)
+
+
+def parse_part_page(soup, data):
+    """Fill data from a server-rendered product page; returns False if the page needs a browser"""
+    pd_wrap = soup.select_one("div.pd__wrap.row")
+    if pd_wrap is None:
+        return False
+    # The price can be filled in after load; without it the part would be dropped downstream
+    if not soup_text(soup, "span.price.pd__price span.js-partPrice"):
+        return False
+    
+    fields = {
+        'part_id': "span[itemprop='productID']",
+        'brand': "span[itemprop='brand'] span[itemprop='name']",
+        'availability': "span[itemprop='availability']",
+        'mpn_id': "span[itemprop='mpn']",
+        'replace_parts': "div[data-collapse-container='{\"targetClassToggle\":\"d-none\"}']",
+        'part_price': "span.price.pd__price span.js-partPrice",
     }
+    for key, selector in fields.items():
+        text = soup_text(soup, selector)
+        if text:
+            data[key] = text
     
-    if not safe_navigate(driver, product_url):
-        print(f"✗ Failed to navigate to product {part_name}")
-        return data
+    video_container = soup.select_one("div.yt-video")
+    if video_container is not None and video_container.get("data-yt-init"):
+        data['install_video_url'] = f"https://www.youtube.com/watch?v={video_container['data-yt-init']}"
     
-    # Extract all data fields (same as before)
-    product_id_elements = wait_and_find_elements(driver, By.CSS_SELECTOR, "span[itemprop='productID']")
-    if product_id_elements:
-        data['part_id'] = safe_get_text(product_id_elements[0])
+    for div in pd_wrap.select("div.col-md-6.mt-3"):
+        header_text = soup_text(div, "div.bold.mb-1")
+        if not header_text:
+            continue
+        full_text = div.get_text("\n", strip=True)
+        if "This part fixes the following symptoms:" in header_text:
+            data['symptoms'] = full_text.replace(header_text, "").strip()
+        elif "This part works with the following products:" in header_text:
+            data['product_types'] = full_text.replace(header_text, "").strip()
     
-    brand_element = wait_and_find_element(driver, By.CSS_SELECTOR, "span[itemprop='brand'] span[itemprop='name']")
-    if brand_element:
-        data['brand'] = safe_get_text(brand_element)
+    install_container = soup.select_one("div.d-flex.flex-lg-grow-1.col-lg-7.col-12.justify-content-lg-between.mt-lg-0.mt-2")
+    if install_container is not None:
+        d_flex_divs = install_container.select(".d-flex")
+        if len(d_flex_divs) >= 2:
+            data['install_difficulty'] = soup_text(d_flex_divs[0], "p") or data['install_difficulty']
+            data['install_time'] = soup_text(d_flex_divs[1], "p") or data['install_time']
     
-    availability_element = wait_and_find_element(driver, By.CSS_SELECTOR, "span[itemprop='availability']")
-    if availability_element:
-        data['availability'] = safe_get_text(availability_element)
+    return True
+
+
+def parse_part_links(soup, page_url):
+    """[name, href] for every part on a server-rendered category page, like PART_LINKS_SCRIPT"""
+    part_links = []
+    for div in soup.select("div.nf__part.mb-3"):
+        link = div.select_one(".nf__part__detail__title")
+        span = link.select_one("span") if link is not None else None
+        if span is not None:
+            href = link.get("href")
+            part_links.append([span.get_text(strip=True), urllib.parse.urljoin(page_url, href) if href else None])
+    return part_links
+
+
+def parse_brand_links(soup, page_url):
+    """Absolute href of the first link in each item of the first brand list, like BRAND_LINKS_SCRIPT"""
+    ul = soup.select_one(".nf__links")
+    if ul is None:
+        return []
+    link_urls = []
+    for li in ul.select("li"):
+        link = li.select_one("a")
+        if link is not None and link.get("href"):
+            link_urls.append(urllib.parse.urljoin(page_url, link["href"]))
+    return link_urls
+
+
+# Same selectors as parse_part_page, evaluated in the page by the browser fallback
+PART_PAGE_SCRIPT = r"""
+const text = (root, selector) => {
+    const el = root.querySelector(selector);
+    return el ? el.innerText.trim() : null;
+};
+const data = {
+    part_id: text(document, "span[itemprop='productID']"),
+    brand: text(document, "span[itemprop='brand'] span[itemprop='name']"),
+    availability: text(document, "span[itemprop='availability']"),
+    mpn_id: text(document, "span[itemprop='mpn']"),
+    replace_parts: text(document, "div[data-collapse-container='{\"targetClassToggle\":\"d-none\"}']"),
+    part_price: text(document, "span.price.pd__price span.js-partPrice"),
+    video_id: document.querySelector("div.yt-video")?.dataset.ytInit || null
+};
+const wrap = document.querySelector("div.pd__wrap.row");
+if (wrap) {
+    for (const div of wrap.querySelectorAll("div.col-md-6.mt-3")) {
+        const header = text(div, "div.bold.mb-1");
+        if (!header) continue;
+        const rest = div.innerText.replace(header, "").trim();
+        if (header.includes("This part fixes the following symptoms:")) data.symptoms = rest;
+        else if (header.includes("This part works with the following products:")) data.product_types = rest;
+    }
+}
+const install = document.querySelector("div.d-flex.flex-lg-grow-1.col-lg-7.col-12.justify-content-lg-between.mt-lg-0.mt-2");
+if (install) {
+    const flex = install.querySelectorAll(".d-flex");
+    if (flex.length >= 2) {
+        data.install_difficulty = text(flex[0], "p");
+        data.install_time = text(flex[1], "p");
+    }
+}
+return data;
+"""
+
+
+# [name, href] for every part listed on a category page (browser fallback of parse_part_links)
+PART_LINKS_SCRIPT = """
+return Array.from(document.querySelectorAll("div.nf__part.mb-3"), div => {
+    const a = div.querySelector(".nf__part__detail__title");
+    const span = a && a.querySelector("span");
+    return span ? [span.innerText, a.href] : null;
+}).filter(Boolean);
+"""
+
+# href of the first link in each item of the first brand list (browser fallback of parse_brand_links)
+BRAND_LINKS_SCRIPT = """
+const ul = document.querySelector(".nf__links");
+if (!ul) return [];
+return Array.from(ul.querySelectorAll("li"), li => li.querySelector("a")?.href).filter(Boolean);
+"""
+
+
+# Each part worker thread owns at most one Chrome and one Playwright Chromium,
+# each started on its first use as a browser fallback
+_part_worker = threading.local()
+_part_drivers = []
+
+
+def get_part_driver():
+    """Return the current worker thread's driver, starting it if needed"""
+    driver = getattr(_part_worker, "driver", None)
+    if driver is None:
+        driver = setup_driver()
+        _part_worker.driver = driver
+        _part_drivers.append(driver)
+    return driver
+
+
+def quit_part_drivers():
+    """Quit every driver started by part worker threads"""
+    while _part_drivers:
+        driver = _part_drivers.pop()
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+
+def block_resource(route):
+    """Playwright route handler that drops subresources the scraper never reads"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+
+def get_part_page():
+    """Return the current worker thread's Playwright page, launching Chromium if needed"""
+    page = getattr(_part_worker, "page", None)
+    if page is None:
+        # Playwright objects are bound to the thread that made them, so each worker owns its browser
+        _part_worker.playwright = sync_playwright().start()
+        browser = _part_worker.playwright.chromium.launch(
+            headless=True, args=["--disable-blink-features=AutomationControlled"])
+        context = browser.new_context(user_agent=HTTP_HEADERS['User-Agent'])
+        context.add_init_script(STEALTH_SCRIPT)
+        context.route("**/*", block_resource)
+        page = context.new_page()
+        _part_worker.page = page
+    return page
+
+
+def close_part_page():
+    """Stop the current worker thread's Playwright; must run on the thread that started it"""
+    playwright = getattr(_part_worker, "playwright", None)
+    _part_worker.playwright = None
+    _part_worker.page = None
+    if playwright is not None:
+        try:
+            # Stopping the driver also closes the browser it launched
+            playwright.stop()
+        except PlaywrightError:
+            pass
+
+
+def scrape_part_page_playwright(product_url):
+    """Read a JS-rendered product page with Playwright; returns None so Selenium can retry"""
+    pace(urllib.parse.urlparse(product_url).netloc, 1.5)
+    try:
+        page = get_part_page()
+        page.goto(product_url, wait_until="domcontentloaded", timeout=60000)
+        page.wait_for_selector("div.pd__wrap", state="attached", timeout=30000)
+        fields = page.evaluate(f"() => {{{PART_PAGE_SCRIPT}}}")
+        if not fields.get('part_price'):
+            # Same short grace period as the Selenium path for a late price
+            try:
+                page.wait_for_selector("span.price.pd__price span.js-partPrice:not(:empty)", timeout=2000)
+                fields = page.evaluate(f"() => {{{PART_PAGE_SCRIPT}}}")
+            except PlaywrightError:
+                pass
+        return fields
+    except PlaywrightError as e:
+        print(f"Playwright failed for {product_url}: {e}")
+        # A dead browser would fail every later page too, so start over on the next one
+        page = getattr(_part_worker, "page", None)
+        if page is None or not page.context.browser.is_connected():
+            close_part_page()
+        return None
+
+
+def scrape_part_info(part_name, product_url, driver=None):
+    """Scrape information for a specific part from its product page."""
+    data = dict.fromkeys(FIELDNAMES, 'N/A')
+    data['part_name'] = part_name
+    data['product_url'] = product_url
     
-    video_container = wait_and_find_element(driver, By.CSS_SELECTOR, "div.yt-video")
-    if video_container:
-        video_id = safe_get_attribute(video_container, "data-yt-init")
-        if video_id:
-            data['install_video_url'] = f"https://www.youtube.com/watch?v={video_id}"
+    # Product pages are server-rendered; only start the browser when the HTML is incomplete
+    soup = fetch_page(product_url)
+    if soup is not None and parse_part_page(soup, data):
+        print(f"✓ Scraped: {data['part_name']} | Price: {data['part_price']} | ID: {data['part_id']}")
+        return data
+    print(f"Static fetch incomplete for {part_name}, falling back to browser...")
     
-    mpn_elements = wait_and_find_elements(driver, By.CSS_SELECTOR, "span[itemprop='mpn']")
-    if mpn_elements:
-        data['mpn_id'] = safe_get_text(mpn_elements[0])
+    fields = None
+    if sync_playwright is not None:
+        fields = scrape_part_page_playwright(product_url)
     
-    replace_parts_elements = wait_and_find_elements(driver, By.CSS_SELECTOR, "div[data-collapse-container='{\"targetClassToggle\":\"d-none\"}']")
-    if replace_parts_elements:
-        data['replace_parts'] = safe_get_text(replace_parts_elements[0])
+    if fields is None:
+        if driver is None:
+            driver = get_part_driver()
+        
+        if not safe_navigate(driver, product_url):
+            print(f"✗ Failed to navigate to product {part_name}")
+            return data
+        
+        # One round trip for every field instead of a WebDriver call per selector
+        fields = driver.execute_script(PART_PAGE_SCRIPT)
+        
+        # The price is normally in the DOM with pd__wrap; only wait if it is genuinely late
+        if not fields.get('part_price'):
+            price_element = wait_and_find_element(driver, By.CSS_SELECTOR, "span.price.pd__price span.js-partPrice")
+            try:
+                if price_element is not None:
+                    fields['part_price'] = price_element.text.strip()
+            except StaleElementReferenceException as e:
+                print(f"Price element went stale for {part_name}: {e}")
     
-    wait = WebDriverWait(driver, 10)
-    try:
-        price_container = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "span.price.pd__price")))
-        if price_container:
-            time.sleep(1)
-            price_element = price_container.find_element(By.CSS_SELECTOR, "span.js-partPrice")
-            if price_element:
-                data['part_price'] = safe_get_text(price_element)
-    except:
-        pass
-    
-    pd_wrap = wait_and_find_element(driver, By.CSS_SELECTOR, "div.pd__wrap.row")
-    if pd_wrap:
-        info_divs = pd_wrap.find_elements(By.CSS_SELECTOR, "div.col-md-6.mt-3")
-        for div in info_divs:
-            header = div.find_element(By.CSS_SELECTOR, "div.bold.mb-1")
-            if not header:
-                continue
-            header_text = safe_get_text(header)
-            if "This part fixes the following symptoms:" in header_text:
-                data['symptoms'] = extract_text_after_header(div, header_text)
-            elif "This part works with the following products:" in header_text:
-                data['product_types'] = extract_text_after_header(div, header_text)
-    
-    install_container = wait_and_find_element(driver, By.CSS_SELECTOR, "div.d-flex.flex-lg-grow-1.col-lg-7.col-12.justify-content-lg-between.mt-lg-0.mt-2")
-    if install_container:
-        d_flex_divs = install_container.find_elements(By.CLASS_NAME, "d-flex")
-        if len(d_flex_divs) >= 2:
-            difficulty_p = d_flex_divs[0].find_element(By.TAG_NAME, "p")
-            if difficulty_p:
-                data['install_difficulty'] = safe_get_text(difficulty_p)
-            time_p = d_flex_divs[1].find_element(By.TAG_NAME, "p")
-            if time_p:
-                data['install_time'] = safe_get_text(time_p)
+    video_id = fields.pop('video_id')
+    if video_id:
+        data['install_video_url'] = f"https://www.youtube.com/watch?v={video_id}"
+    for key, value in fields.items():
+        if value:
+            data[key] = value
     
     print(f"✓ Scraped: {data['part_name']} | Price: {data['part_price']} | ID: {data['part_id']}")
     return data
 
 
-def process_category_page(driver, link_url):
-    """Process a category page and scrape all parts within it."""
+def scrape_part_job(job):
+    """Scrape one part in a worker thread"""
+    idx, total, part_name, product_url = job
+    print(f"\n[{idx}/{total}] Processing: {part_name}")
+    return scrape_part_info(part_name, product_url)
+
+
+def scrape_part_worker(job_queue):
+    """Worker thread: scrape (idx, data) pairs off job_queue until it is empty"""
+    results = []
+    try:
+        while True:
+            try:
+                job = job_queue.get_nowait()
+            except queue.Empty:
+                return results
+            results.append((job[0], scrape_part_job(job)))
+    finally:
+        # Playwright can only be closed from its own thread, so each worker cleans up on exit
+        close_part_page()
+
+
+def get_part_links(link_url):
+    """[name, href] for every part on a category page; None if the page could not be loaded"""
+    # Listings are server-rendered like product pages, so Chrome is only a fallback
+    soup = fetch_page(link_url)
+    if soup is not None:
+        part_links = parse_part_links(soup, link_url)
+        if part_links:
+            return part_links
+    print(f"Static listing incomplete for {link_url}, falling back to browser...")
+    
+    driver = get_brand_driver()
+    if not safe_navigate(driver, link_url):
+        return None
+    # safe_navigate already waited for the page; one script call returns every (name, href)
+    return driver.execute_script(PART_LINKS_SCRIPT)
+
+
+def process_category_page(link_url, workers=PART_WORKERS):
+    """Process a category page and scrape all parts within it; None if the page could not be loaded."""
     parts_data = []
     print(f"\n{'='*60}")
     print(f"Processing category: {link_url}")
     print(f"{'='*60}")
     
-    if not safe_navigate(driver, link_url):
+    part_links = get_part_links(link_url)
+    if part_links is None:
         print(f"✗ Failed to navigate to category")
-        return parts_data
-    
-    part_divs = wait_and_find_elements(driver, By.CSS_SELECTOR, "div.nf__part.mb-3")
-    if not part_divs:
+        return None
+    if not part_links:
         print(f"✗ No parts found in category")
         return parts_data
         
-    print(f"Found {len(part_divs)} parts in category")
+    print(f"Found {len(part_links)} parts in category")
     
-    part_info = []
-    for part_div in part_divs:
-        try:
-            a_tag = part_div.find_element(By.CLASS_NAME, "nf__part__detail__title")
-            if not a_tag:
-                continue
-            part_name = safe_get_text(a_tag.find_element(By.TAG_NAME, "span"))
-            href = safe_get_attribute(a_tag, "href")
-            if href and is_valid_url(href):
-                part_info.append((part_name, href))
-        except:
-            continue
+    part_info = [(part_name, href) for part_name, href in part_links if href and is_valid_url(href)]
+    
+    # Parts saved by an earlier run are already in the consolidated output
+    already_seen = sum(href in _seen for _, href in part_info)
+    if already_seen:
+        print(f"Skipping {already_seen} parts saved by an earlier run")
+        part_info = [(part_name, href) for part_name, href in part_info if href not in _seen]
     
     if not part_info:
         print(f"✗ No valid parts found")
         return parts_data
     
-    print(f"Processing {len(part_info)} parts...")
-    for idx, (part_name, product_url) in enumerate(part_info, 1):
-        print(f"\n[{idx}/{len(part_info)}] Processing: {part_name}")
-        part_data = scrape_part_info(driver, part_name, product_url)
-        parts_data.append(part_data)
-        
-        # Add delay between parts
-        time.sleep(random.uniform(5, 10))
-        
-        if not safe_navigate(driver, link_url):
-            print(f"✗ Failed to return to category. Stopping.")
-            break
+    # Part URLs are already collected, so the category page never has to be reloaded
+    jobs = [(idx, len(part_info), part_name, product_url)
+            for idx, (part_name, product_url) in enumerate(part_info, 1)]
+    print(f"Processing {len(part_info)} parts with {workers} workers...")
+    job_queue = queue.SimpleQueue()
+    for job in jobs:
+        job_queue.put(job)
+    try:
+        # Each worker drains the shared queue, so its browsers live as long as the thread
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            batches = list(executor.map(scrape_part_worker, [job_queue] * workers))
+    finally:
+        quit_part_drivers()
+    
+    # Back in listing order, as the single-thread loop produced it
+    parts_data = [data for _, data in sorted(itertools.chain.from_iterable(batches), key=lambda pair: pair[0])]
     
     return parts_data
 
@@ -273,8 +583,15 @@ def setup_driver():
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-blink-features=AutomationControlled")
         chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--start-maximized")
-        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument("--window-size=1280,720")
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        
+        # Headless with background services off, so more workers fit in the same RAM
+        for flag in CHROME_LEAN_FLAGS:
+            chrome_options.add_argument(flag)
+        
+        # driver.get returns at DOMContentLoaded; the sentinel waits cover the rest
+        chrome_options.page_load_strategy = 'eager'
         
         # Realistic user agent
         user_agents = [
@@ -303,114 +620,211 @@ def setup_driver():
         driver.set_script_timeout(30)
         
         # Stealth JavaScript
-        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
-            'source': '''
-                Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
-                window.chrome = {runtime: {}};
-            '''
-        })
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': STEALTH_SCRIPT})
+        
+        # Only the HTML is scraped, so skip images, fonts, styles and trackers
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
         
         return driver
         
-    except Exception as e:
+    except WebDriverException as e:
         print(f"✗ Failed to create driver: {str(e)}")
         raise
 
 
-def save_brand_data(brand_data, brand_name, output_dir="scraped_data"):
-    """Save data for a single brand to both CSV and JSON formats."""
+def save_brand_data(brand_data, brand_name, output_dir=OUTPUT_DIR, append=False):
+    """Save data for a single brand to both CSV and JSON formats.
+    
+    With append=True (resumed runs) the parts are added to any files an earlier
+    run left for this brand instead of replacing them.
+    """
     if not brand_data:
         return
     
-    os.makedirs(output_dir, exist_ok=True)
     clean_brand_name = brand_name.replace(" ", "_").replace("/", "-")
     
     try:
         csv_filename = os.path.join(output_dir, f"{clean_brand_name}.csv")
-        with open(csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=brand_data[0].keys())
-            writer.writeheader()
+        with open(csv_filename, 'a' if append else 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=FIELDNAMES)
+            if csvfile.tell() == 0:
+                writer.writeheader()
             writer.writerows(brand_data)
         print(f"✓ Saved CSV: {csv_filename}")
         
         json_filename = os.path.join(output_dir, f"{clean_brand_name}.json")
+        records = brand_data
+        if append and os.path.exists(json_filename):
+            # Keep the file a single JSON array by merging with what is already there
+            with open(json_filename, 'rb') as jsonfile:
+                records = loads_json(jsonfile.read()) + brand_data
         with open(json_filename, 'w', encoding='utf-8') as jsonfile:
-            json.dump(brand_data, jsonfile, indent=2, ensure_ascii=False)
+            jsonfile.write(dumps_json(records, indent=True))
         print(f"✓ Saved JSON: {json_filename}")
         
-    except Exception as e:
+    except (OSError, ValueError, TypeError) as e:
         print(f"✗ Error saving data: {e}")
 
 
+# Reused across the brands handled by one worker process
+_brand_driver = None
+_brand_driver_uses = 0
+
+
+def get_brand_driver():
+    """Return this process's brand driver, starting or recycling it as needed"""
+    global _brand_driver, _brand_driver_uses
+    if _brand_driver is not None and _brand_driver_uses >= BRAND_DRIVER_MAX_USES:
+        quit_brand_driver()
+    
+    if _brand_driver is not None:
+        # Start each brand with a clean session
+        try:
+            _brand_driver.delete_all_cookies()
+            _brand_driver.execute_script("window.localStorage.clear();")
+        except WebDriverException as e:
+            print(f"Driver unusable, restarting Chrome: {e}")
+            quit_brand_driver()
+    
+    if _brand_driver is None:
+        _brand_driver = setup_driver()
+        _brand_driver_uses = 0
+    _brand_driver_uses += 1
+    return _brand_driver
+
+
+def quit_brand_driver():
+    """Quit this process's brand driver if one is running"""
+    global _brand_driver
+    if _brand_driver is not None:
+        try:
+            _brand_driver.quit()
+        except WebDriverException:
+            pass
+        _brand_driver = None
+
+
 def process_brand(brand_url, max_retries=3):
     """Process a brand page and its related pages."""
     brand_name = brand_url.split("/")[-1].replace("-Refrigerator-Parts.htm", "")
     brand_parts_data = []
-    driver = None
     
     for attempt in range(max_retries):
         try:
-            driver = setup_driver()
-            
-            if not safe_navigate(driver, brand_url):
-                if driver:
-                    driver.quit()
-                continue
-            
             print(f"\n{'#'*60}")
             print(f"# BRAND: {brand_name}")
             print(f"{'#'*60}")
             
-            brand_data = process_category_page(driver, brand_url)
+            brand_data = process_category_page(brand_url)
+            if brand_data is None:
+                quit_brand_driver()
+                continue
             brand_parts_data.extend(brand_data)
             print(f"✓ Found {len(brand_data)} products on brand page")
             
-            driver.quit()
             return brand_name, brand_parts_data
             
-        except Exception as e:
+        except WebDriverException as e:
             print(f"✗ Attempt {attempt + 1} failed: {e}")
-            if driver:
-                driver.quit()
+            quit_brand_driver()
             if attempt < max_retries - 1:
                 time.sleep(10)
+        except Exception as e:
+            # Worker boundary: a bug won't fix itself on retry, but must not take down the pool
+            print(f"✗ Unexpected {type(e).__name__} for {brand_name}: {e}")
+            quit_brand_driver()
+            break
     
     return brand_name, brand_parts_data
 
 
-def get_brand_links(driver, base_url):
-    """Get all brand links from the main page"""
-    brand_links = []
-    if not safe_navigate(driver, base_url):
-        return brand_links
+# URLs finished by earlier runs; set in every brand worker by init_brand_worker
+_seen = set()
+
 
+def load_seen(output_name):
+    """Read the URLs recorded by earlier runs of output_name"""
     try:
-        wait = WebDriverWait(driver, 10)
-        wait.until(EC.presence_of_element_located((By.CLASS_NAME, "nf__links")))
-        ul_tags = driver.find_elements(By.CLASS_NAME, "nf__links")
-        if ul_tags:
-            li_tags = ul_tags[0].find_elements(By.TAG_NAME, "li")
-            print(f"Found {len(li_tags)} brand links")
-            
-            for li_tag in li_tags:
-                try:
-                    a_tag = li_tag.find_element(By.TAG_NAME, "a")
-                    link_url = safe_get_attribute(a_tag, "href")
-                    if link_url and is_valid_url(link_url):
-                        brand_links.append(link_url)
-                        print(f"  • {link_url}")
-                except:
-                    continue
-    except Exception as e:
-        print(f"✗ Error finding brand links: {e}")
+        with open(SEEN_FILE_PATTERN.format(output_name=output_name), encoding='utf-8') as f:
+            return set(f.read().splitlines())
+    except FileNotFoundError:
+        return set()
+
+
+def mark_seen(output_name, urls):
+    """Record URLs whose data has been saved so later runs of output_name skip them"""
+    with open(SEEN_FILE_PATTERN.format(output_name=output_name), 'a', encoding='utf-8') as f:
+        f.write("".join(url + "\n" for url in urls))
+        f.flush()
+
+
+def scrape_brand_job(brand_url):
+    """Pool task: process one brand and report which URL it came from"""
+    brand_name, brand_data = process_brand(brand_url)
+    return brand_url, brand_name, brand_data
+
+
+def init_brand_worker(seen, last_hit, pace_lock):
+    """Reseed and stagger each brand worker so forked workers don't hit the site in lockstep"""
+    global _seen, _last_hit, _pace_lock
+    _seen = seen
+    # Shared pacing state, so the pool as a whole keeps pace()'s gap per host
+    _last_hit = last_hit
+    _pace_lock = pace_lock
+    random.seed()
+    # Pool workers exit without running atexit hooks, so register the cleanup here
+    Finalize(None, quit_brand_driver, exitpriority=10)
+    time.sleep(random.randint(0, 20) * 0.1)
+
+
+def get_brand_links(base_url):
+    """Get all brand links from the main page"""
+    brand_links = []
+    soup = fetch_page(base_url)
+    link_urls = parse_brand_links(soup, base_url) if soup is not None else []
+    
+    if not link_urls:
+        print("Static brand list incomplete, falling back to browser...")
+        driver = setup_driver()
+        try:
+            if not safe_navigate(driver, base_url):
+                return brand_links
+            link_urls = driver.execute_script(BRAND_LINKS_SCRIPT)
+        except WebDriverException as e:
+            print(f"✗ Error finding brand links: {e}")
+            return brand_links
+        finally:
+            driver.quit()
+    
+    print(f"Found {len(link_urls)} brand links")
+    for link_url in link_urls:
+        if is_valid_url(link_url):
+            brand_links.append(link_url)
+            print(f"  • {link_url}")
     
     return brand_links
 
 
-def scrape_all_parts(base_url, max_brands=10):
-    """Scrape all parts with incremental saving and limit to first N brands."""
-    all_parts_data = []
-    driver = None
+def ndjson_to_json(ndjson_path, json_path):
+    """Rewrite an NDJSON file as an indented JSON array, one record at a time"""
+    count = 0
+    with open(ndjson_path, encoding='utf-8') as src, open(json_path, 'w', encoding='utf-8') as dst:
+        dst.write("[")
+        for line in src:
+            if not line.strip():
+                continue
+            record = dumps_json(loads_json(line), indent=True)
+            dst.write(",\n" if count else "\n")
+            dst.write(textwrap.indent(record, "  "))
+            count += 1
+        dst.write("\n]" if count else "]")
+    return count
+
+
+def scrape_all_parts(base_url, output_name, max_brands=10, workers=BRAND_WORKERS):
+    """Scrape all parts, appending each brand to the consolidated CSV/NDJSON as it finishes."""
+    total_parts = 0
     brand_links = []
     
     try:
@@ -418,81 +832,108 @@ def scrape_all_parts(base_url, max_brands=10):
         print("STARTING SCRAPER")
         print("="*60)
         
-        driver = setup_driver()
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
         print("\nGathering brand links...")
-        brand_links = get_brand_links(driver, base_url)
-        driver.quit()
-        driver = None
+        brand_links = get_brand_links(base_url)
         
         if not brand_links:
             print("✗ No brand links found")
-            return all_parts_data
+            return total_parts
+        
+        brand_links = brand_links[:max_brands]
+        print(f"Limiting to the first {len(brand_links)} brands")
+        
+        # Resume: skip brands finished by an earlier run and append to its output
+        seen = load_seen(output_name)
+        resuming = bool(seen)
+        done_brands = [url for url in brand_links if url in seen]
+        brand_links = [url for url in brand_links if url not in seen]
+        if done_brands:
+            print(f"Skipping {len(done_brands)} brands saved by an earlier run")
+        if not brand_links:
+            print("✓ Every brand was already scraped")
+            return total_parts
         
-        brand_links = brand_links[10]
         print(f"\n{'='*60}")
         print(f"Processing {len(brand_links)} brands")
         print(f"{'='*60}\n")
         
-        for idx, brand_url in enumerate(brand_links, 1):
-            print(f"\n\n{'*'*60}")
-            print(f"* BRAND {idx}/{len(brand_links)}")
-            print(f"{'*'*60}")
-            
-            try:
-                brand_name, brand_data = process_brand(brand_url)
-                
-                if brand_data:
-                    save_brand_data(brand_data, brand_name)
-                    all_parts_data.extend(brand_data)
-                    print(f"\n✓ Completed {idx}/{len(brand_links)}: {brand_name} ({len(brand_data)} parts)")
-                else:
-                    print(f"\n⚠ No data for: {brand_name}")
-                
-                # Delay between brands
-                if idx < len(brand_links):
-                    delay = random.uniform(15, 30)
-                    print(f"\nWaiting {delay:.1f}s before next brand...")
-                    time.sleep(delay)
+        # Each worker reuses one Chrome across its brands; on success close/join (not
+        # terminate) lets workers exit normally so their drivers are quit
+        workers = min(workers, len(brand_links))
+        print(f"Using {workers} worker processes")
+        manager = multiprocessing.Manager()
+        pool = multiprocessing.Pool(processes=workers, initializer=init_brand_worker,
+                                    initargs=(seen, manager.dict(), manager.Lock()))
+        try:
+            # Only one brand is held in memory, and a crash keeps every finished brand
+            mode = 'a' if resuming else 'w'
+            with open(f"{output_name}.csv", mode, newline='', encoding='utf-8') as csv_file, \
+                    open(f"{output_name}.ndjson", mode, encoding='utf-8') as ndjson_file:
+                writer = csv.DictWriter(csv_file, fieldnames=FIELDNAMES)
+                if csv_file.tell() == 0:
+                    writer.writeheader()
+                results = pool.imap_unordered(scrape_brand_job, brand_links)
+                for idx, (brand_url, brand_name, brand_data) in enumerate(results, 1):
+                    print(f"\n\n{'*'*60}")
+                    print(f"* BRAND {idx}/{len(brand_links)}")
+                    print(f"{'*'*60}")
                     
-            except Exception as e:
-                print(f"\n✗ Error processing brand: {e}")
-                continue
+                    try:
+                        if brand_data:
+                            save_brand_data(brand_data, brand_name, append=resuming)
+                            writer.writerows(brand_data)
+                            ndjson_file.write("".join(dumps_json(d) + "\n" for d in brand_data))
+                            csv_file.flush()
+                            ndjson_file.flush()
+                            mark_seen(output_name, [part['product_url'] for part in brand_data] + [brand_url])
+                            total_parts += len(brand_data)
+                            print(f"\n✓ Completed {idx}/{len(brand_links)}: {brand_name} ({len(brand_data)} parts)")
+                        else:
+                            print(f"\n⚠ No data for: {brand_name}")
+                            
+                    except (OSError, ValueError, TypeError) as e:
+                        print(f"\n✗ Error saving brand {brand_name}: {e}")
+                        continue
+        except BaseException:
+            # A Ctrl-C or crash can lose a worker's task, and join() would then wait forever
+            pool.terminate()
+            raise
+        else:
+            pool.close()
+        finally:
+            pool.join()
+            manager.shutdown()
     
-    except Exception as e:
+    except (WebDriverException, OSError) as e:
         print(f"✗ Error during scraping: {e}")
     
-    finally:
-        if driver:
-            driver.quit()
-    
     print(f"\n\n{'='*60}")
     print(f"SCRAPING COMPLETE!")
     print(f"Brands processed: {len(brand_links)}")
-    print(f"Total parts: {len(all_parts_data)}")
+    print(f"Total parts: {total_parts}")
     print(f"{'='*60}\n")
-    return all_parts_data
+    return total_parts
 
 
 if __name__ == "__main__":
     base_url = "https://www.partselect.com/Refrigerator-Parts.htm"
+    output_name = "dishwasher_parts_consolidated"
     print("\n🚀 Starting refrigerator parts scraper (first 10 brands)...")
     
-    parts_data = scrape_all_parts(base_url, max_brands=10)
+    total_parts = scrape_all_parts(base_url, output_name, max_brands=10)
     
-    if parts_data:
-        print("\nSaving consolidated files...")
-        
-        with open("dishwasher_parts_consolidated.csv", 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=parts_data[0].keys())
-            writer.writeheader()
-            writer.writerows(parts_data)
-        print("✓ Saved: dishwasher_parts_consolidated.csv")
+    # A resumed run may add nothing new, but earlier runs' NDJSON still needs converting
+    ndjson_path = f"{output_name}.ndjson"
+    if os.path.exists(ndjson_path) and os.path.getsize(ndjson_path) > 0:
+        print(f"✓ Saved: {output_name}.csv")
+        print(f"✓ Saved: {ndjson_path}")
         
-        with open("dishwasher_parts_consolidated.json", 'w', encoding='utf-8') as f:
-            json.dump(parts_data, f, indent=2, ensure_ascii=False)
-        print("✓ Saved: dishwasher_parts_consolidated.json")
+        print("\nSaving consolidated JSON...")
+        saved_parts = ndjson_to_json(ndjson_path, f"{output_name}.json")
+        print(f"✓ Saved: {output_name}.json ({saved_parts} parts)")
         
-        print(f"\n✅ SUCCESS! Scraped {len(parts_data)} total parts")
+        print(f"\n✅ SUCCESS! Scraped {total_parts} new parts this run")
         print(f"📁 Individual brand files: ./scraped_data/")
     else:
-        print("\n⚠️ No data was collected")
\ No newline at end of file
+        print("\n⚠️ No data was collected")